@@ -15,10 +15,13 @@ Files are saved to data/crewscheduling_a{num_airports}_f{num_flights}.csv
 
 import os
 import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 # Configuration
 DATA_DIR = "data"
 RANDOM_SEED = 42  # For reproducibility
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB output buffer per file
 
 # Test configurations: (num_airports, num_flights)
 # Varying both dimensions for comprehensive benchmarking
@@ -40,6 +43,12 @@ TEST_CONFIGS = [
 MIN_FLIGHT_DURATION = 60    # Minimum flight duration in time units
 MAX_FLIGHT_DURATION = 600   # Maximum flight duration in time units
 TIME_HORIZON = 10000        # Total time span for scheduling
+MAX_DEPARTURE_TIME = TIME_HORIZON - MAX_FLIGHT_DURATION  # Latest departure
+
+# Value ranges sampled for each flight
+DEPARTURE_TIMES = range(0, MAX_DEPARTURE_TIME + 1)
+FLIGHT_DURATIONS = range(MIN_FLIGHT_DURATION, MAX_FLIGHT_DURATION + 1)
+MAX_DUPLICATE_RETRIES = 10  # Redraws allowed per duplicate flight
 
 
 def generate_airports(num_airports):
@@ -66,121 +75,153 @@ def generate_airports(num_airports):
     return airports
 
 
-def generate_flight_schedule(airports, num_flights):
+def generate_flight_schedule(airports, num_flights, rng):
     """
     Generate a random flight schedule.
     
     Strategy: Ensure temporal consistency (arrival before next departure)
     and create a connected network where flights can potentially chain.
     """
-    flights = []
+    num_airports = len(airports)
     
-    for i in range(num_flights):
-        # Random departure and arrival airports (no self-loops)
-        dep_airport = random.choice(airports)
-        arr_airport = random.choice([a for a in airports if a != dep_airport])
-        
-        # Random departure time
-        dep_time = random.randint(0, TIME_HORIZON - MAX_FLIGHT_DURATION)
-        
-        # Random flight duration
-        duration = random.randint(MIN_FLIGHT_DURATION, MAX_FLIGHT_DURATION)
-        arr_time = dep_time + duration
-        
-        flights.append({
-            "departure_airport": dep_airport,
-            "arrival_airport": arr_airport,
-            "departure_time": dep_time,
-            "arrival_time": arr_time
-        })
+    # Draw every field for all flights in one batch per column
+    dep_indices = rng.choices(range(num_airports), k=num_flights)
+    # A non-zero offset guarantees arrival != departure (no self-loops)
+    offsets = rng.choices(range(1, num_airports), k=num_flights)
+    dep_times = rng.choices(DEPARTURE_TIMES, k=num_flights)
+    durations = rng.choices(FLIGHT_DURATIONS, k=num_flights)
     
-    # Sort flights by departure time for better readability
-    flights.sort(key=lambda f: (f["departure_time"], f["departure_airport"]))
+    arr_indices = [(dep + offset) % num_airports
+                   for dep, offset in zip(dep_indices, offsets)]
     
-    return flights
-
-
-def ensure_connectivity(airports, flights):
+    # Redraw flights that repeat an earlier (departure, arrival, departure
+    # time) triple. Retries are capped so dense configs cannot loop forever.
+    seen = set()
+    for i in range(num_flights):
+        key = (dep_indices[i], arr_indices[i], dep_times[i])
+        retries = 0
+        while key in seen and retries < MAX_DUPLICATE_RETRIES:
+            dep = rng.randrange(num_airports)
+            arr = (dep + rng.randrange(1, num_airports)) % num_airports
+            key = (dep, arr, rng.choice(DEPARTURE_TIMES))
+            retries += 1
+        seen.add(key)
+        dep_indices[i], arr_indices[i], dep_times[i] = key
+    
+    arr_times = [dep_time + duration
+                 for dep_time, duration in zip(dep_times, durations)]
+    
+    # Sort flights by departure time, then departure airport name, for
+    # better readability. Both keys are folded into a single int so the
+    # sort compares plain ints instead of building a tuple per flight.
+    name_rank = {airport: rank for rank, airport in enumerate(sorted(airports))}
+    dep_ranks = [name_rank[airport] for airport in airports]
+    keys = [dep_time * num_airports + dep_ranks[dep]
+            for dep, dep_time in zip(dep_indices, dep_times)]
+    order = sorted(range(num_flights), key=keys.__getitem__)
+    
+    # The schedule is stored as parallel typed columns, one entry per
+    # flight, with airports kept as indices into the airports list.
+    # Times fit in 32 bits since they never exceed TIME_HORIZON.
+    return {
+        "departure_airport": array('H', map(dep_indices.__getitem__, order)),
+        "arrival_airport": array('H', map(arr_indices.__getitem__, order)),
+        "departure_time": array('i', map(dep_times.__getitem__, order)),
+        "arrival_time": array('i', map(arr_times.__getitem__, order))
+    }
+
+
+def ensure_connectivity(airports, flights, rng):
     """
     Ensure the flight network has some basic connectivity.
     Add flights if needed to connect isolated airports.
     """
     # Track which airports have at least one departure
-    has_departure = set()
-    has_arrival = set()
-    
-    for flight in flights:
-        has_departure.add(flight["departure_airport"])
-        has_arrival.add(flight["arrival_airport"])
-    
-    # Add flights for airports with no departures
-    for airport in airports:
-        if airport not in has_departure:
-            # Add a departure from this airport
-            other_airport = random.choice([a for a in airports if a != airport])
-            dep_time = random.randint(0, TIME_HORIZON - MAX_FLIGHT_DURATION)
-            duration = random.randint(MIN_FLIGHT_DURATION, MAX_FLIGHT_DURATION)
-            
-            flights.append({
-                "departure_airport": airport,
-                "arrival_airport": other_airport,
-                "departure_time": dep_time,
-                "arrival_time": dep_time + duration
-            })
-
-
-def generate_test_file(num_airports, num_flights):
+    has_departure = set(flights["departure_airport"])
+    has_arrival = set(flights["arrival_airport"])
+    
+    # Add flights for airports with no departures, drawing the whole batch
+    # at once. A non-zero offset from the airport picks uniformly among
+    # the other airports.
+    num_airports = len(airports)
+    missing = [i for i in range(num_airports) if i not in has_departure]
+    offsets = rng.choices(range(1, num_airports), k=len(missing))
+    dep_times = rng.choices(DEPARTURE_TIMES, k=len(missing))
+    durations = rng.choices(FLIGHT_DURATIONS, k=len(missing))
+    
+    for i, offset, dep_time, duration in zip(missing, offsets, dep_times, durations):
+        flights["departure_airport"].append(i)
+        flights["arrival_airport"].append((i + offset) % num_airports)
+        flights["departure_time"].append(dep_time)
+        flights["arrival_time"].append(dep_time + duration)
+
+
+def config_seed(config_index):
+    """Derive a reproducible per-config seed from RANDOM_SEED."""
+    return RANDOM_SEED * 1000003 + config_index
+
+
+def generate_test_file(airports, num_flights, seed):
     """Generate a complete test file with the given configuration."""
-    # Generate airports
-    airports = generate_airports(num_airports)
+    # Private RNG per file so output does not depend on which worker runs it
+    rng = random.Random(seed)
+    
+    num_airports = len(airports)
     
     # Generate flight schedule
-    flights = generate_flight_schedule(airports, num_flights)
+    flights = generate_flight_schedule(airports, num_flights, rng)
     
     # Ensure basic connectivity
-    ensure_connectivity(airports, flights)
+    ensure_connectivity(airports, flights, rng)
     
     # Create output filename
     filename = f"crewscheduling_a{num_airports}_f{num_flights}.csv"
     filepath = os.path.join(DATA_DIR, filename)
     
     # Write to CSV
-    with open(filepath, 'w', newline='') as f:
-        # Write airports header
+    with open(filepath, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+        # Airports header
         airports_str = ";".join(airports)
-        f.write(f"#AIRPORTS,{airports_str}\n")
+        header = f"#AIRPORTS,{airports_str}"
         
-        # Write flight records
-        for flight in flights:
-            f.write(f"{flight['departure_airport']},"
-                   f"{flight['arrival_airport']},"
-                   f"{flight['departure_time']},"
-                   f"{flight['arrival_time']}\n")
+        # Build all flight records in memory and write them in one call
+        rows = ["%s,%s,%d,%d" % (airports[dep], airports[arr], dep_time, arr_time)
+                for dep, arr, dep_time, arr_time in zip(
+                    flights["departure_airport"], flights["arrival_airport"],
+                    flights["departure_time"], flights["arrival_time"])]
+        f.write("\n".join([header, *rows]) + "\n")
     
-    return filename, num_airports, len(flights)
+    return filename, num_airports, len(flights["departure_time"])
 
 
 def main():
     """Main function to generate all test data files."""
-    # Set random seed for reproducibility
-    random.seed(RANDOM_SEED)
-    
     # Create data directory if it doesn't exist
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-        print(f"Created directory: {DATA_DIR}/")
+    os.makedirs(DATA_DIR, exist_ok=True)
     
     print("=== Generating Crew Scheduling Test Data ===")
     print(f"Output directory: {DATA_DIR}/")
     print(f"Random seed: {RANDOM_SEED}")
     print()
     
+    # Airport codes depend only on their index, so build the largest
+    # list once and hand each config a prefix of it
+    airports_full = generate_airports(max(na for na, _ in TEST_CONFIGS))
+    
     generated_files = []
     
-    for num_airports, num_flights in TEST_CONFIGS:
-        filename, na, nf = generate_test_file(num_airports, num_flights)
-        generated_files.append((filename, na, nf))
-        print(f"Generated: {filename} (airports={na}, flights={nf})")
+    # Configs are independent, so generate files in parallel processes;
+    # map() still yields results in config order
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(
+            generate_test_file,
+            [airports_full[:num_airports] for num_airports, _ in TEST_CONFIGS],
+            [num_flights for _, num_flights in TEST_CONFIGS],
+            [config_seed(i) for i in range(len(TEST_CONFIGS))]
+        )
+        for filename, na, nf in results:
+            generated_files.append((filename, na, nf))
+            print(f"Generated: {filename} (airports={na}, flights={nf})")
     
     print()
     print(f"Total files generated: {len(generated_files)}")
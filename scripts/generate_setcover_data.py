@@ -17,10 +17,13 @@ Files are saved to data/setcover_f{num_foods}_n{num_nutrients}.csv
 import os
 import random
 import csv
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 # Configuration
 DATA_DIR = "data"
 RANDOM_SEED = 42  # For reproducibility
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB output buffer per file
 
 # Test configurations: (num_foods, num_nutrients)
 # Varying both dimensions for comprehensive benchmarking
@@ -50,6 +53,14 @@ MIN_NUTRIENTS_PER_FOOD = 3  # Minimum nutrients a food provides
 MAX_NUTRIENT_FRACTION = 0.2  # Maximum fraction of universe a food can cover
 MAX_NUTRIENT_UPPER_LIMIT = 10  # Maximum number of nutrients a food can cover
 
+# Food types used to name generated food items
+FOOD_TYPES = [
+    "Apple", "Banana", "Carrot", "Spinach", "Chicken", "Beef", "Salmon",
+    "Rice", "Pasta", "Bread", "Milk", "Cheese", "Yogurt", "Eggs", "Tofu",
+    "Broccoli", "Tomato", "Potato", "Orange", "Grape", "Lettuce", "Onion",
+    "Garlic", "Pepper", "Corn", "Beans", "Lentils", "Almonds", "Walnuts"
+]
+
 
 def generate_universe(num_nutrients):
     """Generate a universe of nutrient names."""
@@ -71,35 +82,81 @@ def generate_universe(num_nutrients):
     return nutrients
 
 
-def generate_food_item(food_id, universe, min_nutrients, max_nutrients):
-    """Generate a random food item with calories and nutrient coverage."""
-    # Random calorie value
-    calories = random.randint(MIN_CALORIES, MAX_CALORIES)
+def draw_food_parameters(num_foods, universe_size, min_nutrients, max_nutrients, rng):
+    """
+    Draw the numeric fields of every food item in one batch.
     
-    # Random number of nutrients this food provides
-    num_nutrients = random.randint(min_nutrients, max_nutrients)
-    num_nutrients = min(num_nutrients, len(universe))
+    Returns parallel lists of calorie values, nutrient counts and food types,
+    so the per-food work is reduced to sampling its nutrients.
+    """
+    calories = rng.choices(range(MIN_CALORIES, MAX_CALORIES + 1), k=num_foods)
     
-    # Randomly select nutrients
-    nutrients = random.sample(universe, num_nutrients)
+    # Number of nutrients each food provides, capped at the universe size
+    nutrient_counts = rng.choices(range(min_nutrients, max_nutrients + 1), k=num_foods)
+    if max_nutrients > universe_size:
+        nutrient_counts = [min(n, universe_size) for n in nutrient_counts]
     
-    # Generate food name
-    food_types = [
-        "Apple", "Banana", "Carrot", "Spinach", "Chicken", "Beef", "Salmon",
-        "Rice", "Pasta", "Bread", "Milk", "Cheese", "Yogurt", "Eggs", "Tofu",
-        "Broccoli", "Tomato", "Potato", "Orange", "Grape", "Lettuce", "Onion",
-        "Garlic", "Pepper", "Corn", "Beans", "Lentils", "Almonds", "Walnuts"
-    ]
-    food_name = f"{random.choice(food_types)}_{food_id}"
+    food_types = rng.choices(FOOD_TYPES, k=num_foods)
+    
+    return calories, nutrient_counts, food_types
+
+
+def partition_universe(universe_size, num_foods, min_nutrients, max_nutrients, rng):
+    """
+    Split a shuffled universe into disjoint blocks of nutrient indices.
+    
+    Giving the k-th food the k-th block guarantees every nutrient is
+    covered by construction. Blocks hold min_nutrients indices unless
+    there are too few foods, in which case they grow to fit, up to
+    max_nutrients. Raises ValueError if the foods cannot cover the
+    universe even then.
+    """
+    block_size = max(min_nutrients, -(-universe_size // num_foods))
+    if block_size > max_nutrients:
+        raise ValueError(
+            f"{num_foods} foods with at most {max_nutrients} nutrients each "
+            f"cannot cover a universe of {universe_size} nutrients")
+    
+    indices = list(range(universe_size))
+    rng.shuffle(indices)
+    
+    return [indices[i:i + block_size] for i in range(0, universe_size, block_size)]
+
+
+def generate_food_item(food_id, food_type, calories, num_nutrients, universe_size,
+                       rng, required=()):
+    """
+    Generate a food item covering num_nutrients random nutrients.
+    
+    Nutrient indices in required are always included, and the food is
+    topped up with random picks from the rest of the universe. A food
+    whose required block is larger than num_nutrients keeps the whole
+    block, so it covers len(required) nutrients instead (never more than
+    max_nutrients, see partition_universe).
+    """
+    # Randomly select nutrients, stored as compact indices into the universe
+    if required:
+        # Top up by rejection sampling against the chosen indices rather
+        # than building the list of every other nutrient
+        nutrients = array('H', required)
+        chosen = set(required)
+        randrange = rng.randrange
+        while len(nutrients) < num_nutrients:
+            idx = randrange(universe_size)
+            if idx not in chosen:
+                chosen.add(idx)
+                nutrients.append(idx)
+    else:
+        nutrients = array('H', rng.sample(range(universe_size), num_nutrients))
     
     return {
-        "name": food_name,
+        "name": f"{food_type}_{food_id}",
         "calories": calories,
         "nutrients": nutrients
     }
 
 
-def calculate_max_calories(food_items, universe):
+def calculate_max_calories(calories, num_nutrients, rng):
     """
     Calculate a reasonable max calorie limit.
     
@@ -107,101 +164,100 @@ def calculate_max_calories(food_items, universe):
     but low enough to require careful selection.
     Approximately 40-60% of total available calories.
     """
-    total_calories = sum(f["calories"] for f in food_items)
+    total_calories = sum(calories)
     
-    # Use 50% of total as a baseline, with some randomness
-    fraction = random.uniform(0.4, 0.6)
-    max_calories = total_calories * fraction
+    # Use 50% of total as a baseline, with some randomness, but ensure it's
+    # at least enough for the minimum number of foods needed to cover all
+    # nutrients (rough estimate) at the average calories per food
+    fraction = rng.uniform(0.4, 0.6)
+    min_foods_estimate = num_nutrients // 3 + 1
     
-    # Ensure it's at least enough for the minimum number of foods needed
-    # to cover all nutrients (rough estimate)
-    min_foods_estimate = len(universe) // 3 + 1
-    avg_calories = total_calories / len(food_items)
-    min_needed = min_foods_estimate * avg_calories
-    
-    return max(max_calories, min_needed)
+    return max(total_calories * fraction,
+               min_foods_estimate * (total_calories / len(calories)))
 
 
-def ensure_coverage(food_items, universe):
-    """
-    Ensure that the generated food items can potentially cover all nutrients.
-    If any nutrient is not covered, add it to a random food item.
-    """
-    covered = set()
-    for food in food_items:
-        covered.update(food["nutrients"])
-    
-    uncovered = set(universe) - covered
-    
-    # Add uncovered nutrients to random food items
-    for nutrient in uncovered:
-        random_food = random.choice(food_items)
-        random_food["nutrients"].append(nutrient)
+def config_seed(config_index):
+    """Derive a reproducible per-config seed from RANDOM_SEED."""
+    return RANDOM_SEED * 1000003 + config_index
 
 
-def generate_test_file(num_foods, num_nutrients):
+def generate_test_file(num_foods, universe, seed):
     """Generate a complete test file with the given configuration."""
-    # Generate universe
-    universe = generate_universe(num_nutrients)
+    # Private RNG per file so output does not depend on which worker runs it
+    rng = random.Random(seed)
+    
+    num_nutrients = len(universe)
     
     # Calculate nutrient coverage range for foods
     min_nutrients = MIN_NUTRIENTS_PER_FOOD
     max_nutrients = max(MAX_NUTRIENT_UPPER_LIMIT, int(num_nutrients * MAX_NUTRIENT_FRACTION))
     
-    # Generate food items
-    food_items = []
-    for i in range(num_foods):
-        food = generate_food_item(i + 1, universe, min_nutrients, max_nutrients)
-        food_items.append(food)
+    # Draw calories, nutrient counts and food types for all foods at once
+    calories, nutrient_counts, food_types = draw_food_parameters(
+        num_foods, num_nutrients, min_nutrients, max_nutrients, rng)
     
-    # Ensure all nutrients can be covered
-    ensure_coverage(food_items, universe)
+    # Seed the leading foods with a disjoint partition of the universe so
+    # that all nutrients are covered by construction
+    blocks = partition_universe(num_nutrients, num_foods, min_nutrients, max_nutrients, rng)
+    blocks += [()] * (num_foods - len(blocks))
     
-    # Calculate max calories
-    max_calories = calculate_max_calories(food_items, universe)
+    # Max calories only depends on the drawn calories, so it can be fixed
+    # before any food item is built
+    max_calories = calculate_max_calories(calories, num_nutrients, rng)
     
     # Create output filename
     filename = f"setcover_f{num_foods}_n{num_nutrients}.csv"
     filepath = os.path.join(DATA_DIR, filename)
     
-    # Write to CSV
-    with open(filepath, 'w', newline='') as f:
-        # Write universe header
-        universe_str = ";".join(universe)
-        f.write(f"#UNIVERSE,{universe_str}\n")
+    # Write to CSV in binary mode, with nutrient names encoded once up front
+    # rather than on every row
+    universe_bytes = [nutrient.encode() for nutrient in universe]
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        # Write universe and max calories headers
+        universe_str = b";".join(universe_bytes)
+        f.write(b"#UNIVERSE,%s\n#MAX_CALORIES,%.2f\n" % (universe_str, max_calories))
         
-        # Write max calories header
-        f.write(f"#MAX_CALORIES,{max_calories:.2f}\n")
-        
-        # Write food items
-        for food in food_items:
-            nutrients_str = ";".join(food["nutrients"])
-            f.write(f"{food['name']},{food['calories']},{nutrients_str}\n")
+        # Stream food items to the file as they are generated, so only one
+        # food is held in memory at a time
+        write = f.write
+        lookup = universe_bytes.__getitem__
+        for i, (food_type, cal, count, block) in enumerate(
+                zip(food_types, calories, nutrient_counts, blocks)):
+            food = generate_food_item(i + 1, food_type, cal, count, num_nutrients, rng, block)
+            write(b"%s,%d,%s\n" % (food["name"].encode(), food["calories"],
+                                   b";".join(map(lookup, food["nutrients"]))))
     
     return filename, num_foods, num_nutrients
 
 
 def main():
     """Main function to generate all test data files."""
-    # Set random seed for reproducibility
-    random.seed(RANDOM_SEED)
-    
     # Create data directory if it doesn't exist
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-        print(f"Created directory: {DATA_DIR}/")
+    os.makedirs(DATA_DIR, exist_ok=True)
     
     print("=== Generating Set Cover Test Data ===")
     print(f"Output directory: {DATA_DIR}/")
     print(f"Random seed: {RANDOM_SEED}")
     print()
     
+    # Nutrient names depend only on their index, so build the largest
+    # universe once and hand each config a prefix of it
+    universe_full = generate_universe(max(nn for _, nn in TEST_CONFIGS))
+    
     generated_files = []
     
-    for num_foods, num_nutrients in TEST_CONFIGS:
-        filename, nf, nn = generate_test_file(num_foods, num_nutrients)
-        generated_files.append((filename, nf, nn))
-        print(f"Generated: {filename} (foods={nf}, nutrients={nn})")
+    # Configs are independent, so generate files in parallel processes;
+    # map() still yields results in config order
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(
+            generate_test_file,
+            [num_foods for num_foods, _ in TEST_CONFIGS],
+            [universe_full[:num_nutrients] for _, num_nutrients in TEST_CONFIGS],
+            [config_seed(i) for i in range(len(TEST_CONFIGS))]
+        )
+        for filename, nf, nn in results:
+            generated_files.append((filename, nf, nn))
+            print(f"Generated: {filename} (foods={nf}, nutrients={nn})")
     
     print()
     print(f"Total files generated: {len(generated_files)}")